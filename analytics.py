@@ -0,0 +1,126 @@
+"""
+Analytics Engine
+================
+Regresi OLS dan korelasi berbasis sufficient statistics (n, rata-rata,
+co-moment terpusat Σ(xᵢ-x̄ᵢ)(xⱼ-x̄ⱼ)). Statistik dihitung sekali per sel
+dimensi filter; kombinasi filter apa pun cukup menggabungkan sel yang cocok
+dengan update pairwise (Chan et al.), jadi fit trendline hampir gratis,
+stabil secara numerik untuk nilai besar, dan tidak membutuhkan statsmodels.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Kolom numerik yang dimasukkan ke sufficient statistics & matriks korelasi
+NUMERIC_COLUMNS = [
+    'Age',
+    'Avg_Daily_Usage_Hours',
+    'Addicted_Score',
+    'Mental_Health_Score',
+    'Sleep_Hours_Per_Night',
+    'Conflicts_Over_Social_Media'
+]
+
+# Dimensi filter sidebar; satu sel = satu kombinasi nilai dimensi ini
+STATS_DIMENSIONS = ['Gender', 'Age_Group', 'Platform_Type', 'Addiction_Level', 'Vulnerable_Group']
+
+
+def sufficient_stats(df, by=STATS_DIMENSIONS, columns=NUMERIC_COLUMNS):
+    """
+    Sufficient statistics per sel: dict berisi `keys` (DataFrame nilai dimensi),
+    `n` (c,), `mean` (c, k), `comoment` (c, k, k), `min`/`max` (c, k).
+    """
+    codes, keys = pd.MultiIndex.from_frame(df[by]).factorize(use_na_sentinel=False)
+    n_cells, k = len(keys), len(columns)
+    values = df[columns].to_numpy(dtype=float)
+
+    n = np.bincount(codes, minlength=n_cells).astype(float)
+    mean = np.column_stack([np.bincount(codes, values[:, i], n_cells) for i in range(k)]) / n[:, None]
+    # Co-moment dihitung dari nilai yang sudah dipusatkan per sel
+    centered = values - mean[codes]
+    comoment = np.empty((n_cells, k, k))
+    for i in range(k):
+        for j in range(i, k):
+            comoment[:, i, j] = comoment[:, j, i] = np.bincount(
+                codes, centered[:, i] * centered[:, j], n_cells
+            )
+
+    grouped = pd.DataFrame(values).groupby(codes)
+    return {
+        'keys': pd.DataFrame(keys.tolist(), columns=by),
+        'columns': list(columns),
+        'n': n,
+        'mean': mean,
+        'comoment': comoment,
+        'min': grouped.min().to_numpy(),
+        'max': grouped.max().to_numpy()
+    }
+
+
+def merge_stats(stats, mask=None):
+    """
+    Gabungkan sel terpilih (mask boolean atas `keys`) menjadi satu statistik.
+    Bentuk umum update pairwise Chan: M = Σ Mₖ + Σ nₖ(x̄ₖ - x̄)(x̄ₖ - x̄)ᵀ.
+    """
+    if mask is None:
+        mask = np.ones(len(stats['n']), dtype=bool)
+    n = stats['n'][mask]
+    total = n.sum()
+    merged = {'columns': stats['columns'], 'n': total}
+    if total == 0:
+        k = len(stats['columns'])
+        merged['mean'], merged['comoment'] = np.zeros(k), np.zeros((k, k))
+        return merged
+
+    means = stats['mean'][mask]
+    mean = (n[:, None] * means).sum(axis=0) / total
+    offset = means - mean
+    merged['mean'] = mean
+    merged['comoment'] = stats['comoment'][mask].sum(axis=0) + np.einsum('c,ci,cj->ij', n, offset, offset)
+    merged['min'] = stats['min'][mask].min(axis=0)
+    merged['max'] = stats['max'][mask].max(axis=0)
+    return merged
+
+
+def ols_fit(merged, x, y):
+    """
+    Fit y = intercept + slope·x dari statistik gabungan.
+    Mengembalikan dict (n, slope, intercept, r2) atau None jika tidak bisa di-fit.
+    """
+    i, j = merged['columns'].index(x), merged['columns'].index(y)
+    n = merged['n']
+    cov = merged['comoment']
+    if n < 2 or cov[i, i] <= 0:
+        return None
+    slope = cov[i, j] / cov[i, i]
+    intercept = merged['mean'][j] - slope * merged['mean'][i]
+    r2 = cov[i, j] ** 2 / (cov[i, i] * cov[j, j]) if cov[j, j] > 0 else np.nan
+    return {'n': int(n), 'slope': slope, 'intercept': intercept, 'r2': r2}
+
+
+def group_trendlines(stats, x, y, by, mask=None):
+    """
+    Satu fit OLS per nilai dimensi `by` (mis. Addiction_Level), hanya dari
+    sel yang lolos filter. Kolom x_min/x_max untuk menggambar garis.
+    """
+    if mask is None:
+        mask = np.ones(len(stats['n']), dtype=bool)
+    groups = stats['keys'][by].to_numpy()
+    i = stats['columns'].index(x)
+
+    rows = []
+    for group in pd.unique(groups[mask]):
+        merged = merge_stats(stats, mask & (groups == group))
+        fit = ols_fit(merged, x, y)
+        if fit is not None:
+            rows.append({by: group, **fit, 'x_min': merged['min'][i], 'x_max': merged['max'][i]})
+    return pd.DataFrame(rows, columns=[by, 'n', 'slope', 'intercept', 'r2', 'x_min', 'x_max'])
+
+
+def correlation_matrix(merged):
+    """Matriks korelasi Pearson antar semua kolom numerik"""
+    cov = merged['comoment']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std = np.sqrt(np.diag(cov))
+        corr = cov / np.outer(std, std)
+    return pd.DataFrame(corr, index=merged['columns'], columns=merged['columns'])
@@ -11,6 +11,9 @@ import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
+from analytics import correlation_matrix, group_trendlines, merge_stats, sufficient_stats
+from binning import CACHE_MAX_ENTRIES, apply_bins, bin_labels, cohort_mask, threshold, threshold_sidebar
+
 # Page config
 st.set_page_config(
     page_title="Dashboard Kecanduan Media Sosial",
@@ -47,6 +50,16 @@ def load_data():
     df = pd.read_csv('dataset_looker_student_social_media_clean.csv')
     return df
 
+# Rebin ulang sesuai threshold sidebar (cache per spec)
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_binned_data(spec):
+    return apply_bins(load_data(), spec)
+
+# Sufficient statistics per sel filter, dasar trendline & korelasi
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_stats(spec):
+    return sufficient_stats(load_binned_data(spec))
+
 # Main app
 def main():
     st.markdown('<h1 class="main-header">Dashboard Kecanduan Media Sosial Mahasiswa</h1>', unsafe_allow_html=True)
@@ -54,46 +67,51 @@ def main():
     
     # Load data
     try:
-        df = load_data()
+        spec = threshold_sidebar(st)
+        df = load_binned_data(spec)
     except FileNotFoundError:
         st.error("❌ File 'dataset_looker_student_social_media_clean.csv' tidak ditemukan!")
         st.info("Pastikan file CSV ada di folder yang sama dengan app.py")
         return
     
+    high_risk_cutoff = threshold(spec, 'High_Risk_Addiction')
+    high_usage_cutoff = threshold(spec, 'Usage_Duration_Category')
+    high_usage_label = bin_labels(spec['Usage_Duration_Category'])[-1]
+    limits = spec['Vulnerable_Group']['limits']
+    
     # Sidebar filters
     st.sidebar.header("Filter Data")
     
     # Gender filter
     gender_options = ["Semua"] + list(df['Gender'].unique())
-    selected_gender = st.sidebar.selectbox("Gender:", gender_options)
+    selected_gender = st.sidebar.selectbox("Gender:", gender_options, key="filter_Gender")
     
     # Age group filter
     age_options = ["Semua"] + sorted(df['Age_Group'].unique())
-    selected_age = st.sidebar.selectbox("Kelompok Usia:", age_options)
+    selected_age = st.sidebar.selectbox("Kelompok Usia:", age_options, key="filter_Age_Group")
     
     # Platform filter
     platform_options = ["Semua"] + sorted(df['Platform_Type'].unique())
-    selected_platform = st.sidebar.selectbox("Jenis Platform:", platform_options)
+    selected_platform = st.sidebar.selectbox("Jenis Platform:", platform_options, key="filter_Platform_Type")
     
     # Addiction level filter
     addiction_options = ["Semua"] + list(df['Addiction_Level'].unique())
-    selected_addiction = st.sidebar.selectbox("Tingkat Kecanduan:", addiction_options)
+    selected_addiction = st.sidebar.selectbox("Tingkat Kecanduan:", addiction_options, key="filter_Addiction_Level")
     
     # Vulnerable group checkbox
-    show_vulnerable = st.sidebar.checkbox("Tampilkan Hanya Kelompok Rentan", False)
-    
-    # Apply filters
-    filtered_df = df.copy()
-    if selected_gender != "Semua":
-        filtered_df = filtered_df[filtered_df['Gender'] == selected_gender]
-    if selected_age != "Semua":
-        filtered_df = filtered_df[filtered_df['Age_Group'] == selected_age]
-    if selected_platform != "Semua":
-        filtered_df = filtered_df[filtered_df['Platform_Type'] == selected_platform]
-    if selected_addiction != "Semua":
-        filtered_df = filtered_df[filtered_df['Addiction_Level'] == selected_addiction]
-    if show_vulnerable:
-        filtered_df = filtered_df[filtered_df['Vulnerable_Group'].str.contains("Ya", na=False)]
+    show_vulnerable = st.sidebar.checkbox("Tampilkan Hanya Kelompok Rentan", False, key="filter_vulnerable")
+    
+    # Apply filters (mask yang sama dipakai untuk sel sufficient statistics)
+    filters = {
+        'Gender': selected_gender,
+        'Age_Group': selected_age,
+        'Platform_Type': selected_platform,
+        'Addiction_Level': selected_addiction,
+        'Vulnerable_Group': "Rentan" if show_vulnerable else "Semua"
+    }
+    filtered_df = df[cohort_mask(df, filters)]
+    stats = load_stats(spec)
+    cell_mask = cohort_mask(stats['keys'], filters)
     
     st.sidebar.markdown(f"**Total Data Terfilter:** {len(filtered_df)} dari {len(df)}")
     
@@ -113,29 +131,29 @@ def main():
             f"{high_risk}",
             delta=f"{pct_high_risk:.1f}%",
             delta_color="inverse",
-            help="Mahasiswa dengan skor kecanduan ≥8.67 (standar BSMAS)"
+            help=f"Mahasiswa dengan skor kecanduan ≥{high_risk_cutoff:g} (standar BSMAS)"
         )
     
     with col3:
-        vulnerable = len(filtered_df[filtered_df['Vulnerable_Group'].str.contains("Ya", na=False)])
+        vulnerable = len(filtered_df[filtered_df['Vulnerable_Group'].astype(str).str.contains("Ya", na=False)])
         pct_vulnerable = (vulnerable / total * 100) if total > 0 else 0
         st.metric(
             "Kelompok Rentan",
             f"{vulnerable}",
             delta=f"{pct_vulnerable:.1f}%",
             delta_color="inverse",
-            help="Perempuan muda (≤21 th) & Laki-laki sangat muda (≤19 th)"
+            help=f"Perempuan muda (≤{limits['Perempuan']} th) & Laki-laki sangat muda (≤{limits['Laki-laki']} th)"
         )
     
     with col4:
-        high_usage = len(filtered_df[filtered_df['Usage_Duration_Category'] == 'Penggunaan Tinggi (>4 jam)'])
+        high_usage = len(filtered_df[filtered_df['Usage_Duration_Category'] == high_usage_label])
         pct_high_usage = (high_usage / total * 100) if total > 0 else 0
         st.metric(
-            "Penggunaan >4 Jam",
+            f"Penggunaan >{high_usage_cutoff:g} Jam",
             f"{high_usage}",
             delta=f"{pct_high_usage:.1f}%",
             delta_color="inverse",
-            help="Mahasiswa yang menggunakan media sosial >4 jam/hari"
+            help=f"Mahasiswa yang menggunakan media sosial >{high_usage_cutoff:g} jam/hari"
         )
     
     st.markdown("---")
@@ -146,6 +164,7 @@ def main():
     with col1:
         st.subheader("Distribusi Tingkat Kecanduan")
         addiction_counts = filtered_df['Addiction_Level'].value_counts()
+        addiction_counts = addiction_counts[addiction_counts > 0]
         fig1 = px.pie(
             values=addiction_counts.values,
             names=addiction_counts.index,
@@ -188,7 +207,8 @@ def main():
             values='Addicted_Score',
             index='Age_Group',
             columns='Gender',
-            aggfunc='mean'
+            aggfunc='mean',
+            observed=True
         )
         fig3 = px.imshow(
             pivot,
@@ -202,41 +222,44 @@ def main():
     with col2:
         st.subheader("Penggunaan vs Kesehatan Mental")
         
-        # Coba dengan trendline, jika statsmodels tidak ada, skip trendline
-        try:
-            fig4 = px.scatter(
-                filtered_df,
-                x='Avg_Daily_Usage_Hours',
-                y='Mental_Health_Score',
-                color='Addiction_Level',
-                size='Sleep_Hours_Per_Night',
-                hover_data=['Gender', 'Age', 'Platform_Type'],
-                color_discrete_map={
-                    'Risiko Rendah': '#4CAF50',
-                    'Risiko Sedang': '#FF9800',
-                    'Risiko Tinggi': '#F44336'
-                },
-                trendline="ols"
-            )
-        except (ImportError, ModuleNotFoundError):
-            # Fallback: tanpa trendline jika statsmodels tidak terinstall
-            fig4 = px.scatter(
-                filtered_df,
-                x='Avg_Daily_Usage_Hours',
-                y='Mental_Health_Score',
-                color='Addiction_Level',
-                size='Sleep_Hours_Per_Night',
-                hover_data=['Gender', 'Age', 'Platform_Type'],
-                color_discrete_map={
-                    'Risiko Rendah': '#4CAF50',
-                    'Risiko Sedang': '#FF9800',
-                    'Risiko Tinggi': '#F44336'
-                }
-            )
+        addiction_colors = {
+            'Risiko Rendah': '#4CAF50',
+            'Risiko Sedang': '#FF9800',
+            'Risiko Tinggi': '#F44336'
+        }
+        fig4 = px.scatter(
+            filtered_df,
+            x='Avg_Daily_Usage_Hours',
+            y='Mental_Health_Score',
+            color='Addiction_Level',
+            size='Sleep_Hours_Per_Night',
+            hover_data=['Gender', 'Age', 'Platform_Type'],
+            color_discrete_map=addiction_colors
+        )
+        
+        # Trendline OLS per tingkat kecanduan dari sufficient statistics
+        trendlines = group_trendlines(
+            stats, 'Avg_Daily_Usage_Hours', 'Mental_Health_Score', 'Addiction_Level', cell_mask
+        )
+        for fit in trendlines.itertuples():
+            x_line = [fit.x_min, fit.x_max]
+            fig4.add_trace(go.Scatter(
+                x=x_line,
+                y=[fit.intercept + fit.slope * x for x in x_line],
+                mode='lines',
+                line=dict(color=addiction_colors.get(fit.Addiction_Level)),
+                legendgroup=fit.Addiction_Level,
+                showlegend=False,
+                hovertemplate=(
+                    f"<b>OLS {fit.Addiction_Level}</b><br>"
+                    f"y = {fit.slope:.3f}x + {fit.intercept:.3f}<br>"
+                    f"R² = {fit.r2:.3f} (n = {fit.n})<extra></extra>"
+                )
+            ))
         
         fig4.add_hline(y=6, line_dash="dash", line_color="red", 
                        annotation_text="Threshold Kesehatan Mental Buruk")
-        fig4.add_vline(x=4, line_dash="dash", line_color="orange",
+        fig4.add_vline(x=high_usage_cutoff, line_dash="dash", line_color="orange",
                        annotation_text="Threshold Penggunaan Tinggi")
         fig4.update_layout(height=400)
         st.plotly_chart(fig4, use_container_width=True)
@@ -286,6 +309,21 @@ def main():
         )
         st.plotly_chart(fig6, use_container_width=True)
     
+    # Row 4: Correlation Matrix
+    st.markdown("---")
+    st.subheader("Matriks Korelasi Variabel Numerik")
+    corr = correlation_matrix(merge_stats(stats, cell_mask))
+    fig7 = px.imshow(
+        corr,
+        text_auto='.2f',
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        aspect="auto"
+    )
+    fig7.update_layout(height=500)
+    st.plotly_chart(fig7, use_container_width=True)
+    
     # Statistics Summary
     st.markdown("---")
     st.header("Statistik Ringkasan")
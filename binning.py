@@ -0,0 +1,220 @@
+"""
+Binning Engine
+==============
+Spesifikasi binning deklaratif yang dipakai bersama oleh ETL (pvd.ipynb)
+dan dashboard. Semua threshold (BSMAS 8.67, cut 4 jam, kelompok rentan, dll)
+didefinisikan sekali di sini dan diterapkan secara vectorized via np.searchsorted.
+"""
+
+import copy
+
+import numpy as np
+import pandas as pd
+
+INF = float('inf')
+
+# Batas entri st.cache_data yang di-key per spec: tiap langkah threshold di
+# sidebar menghasilkan spec baru (dan satu salinan DataFrame penuh)
+CACHE_MAX_ENTRIES = 8
+
+# Opsi gabungan untuk filter Vulnerable_Group (selain nilai aslinya)
+VULNERABLE_OPTIONS = ['Rentan', 'Non-Rentan']
+
+# Spesifikasi default (sama dengan feature engineering di pvd.ipynb)
+# - edges + labels: interval (a, b] seperti pd.cut; right=False untuk [a, b)
+# - placeholder {0}, {1}, ... pada label diisi dengan edge internal
+# - 'by' + 'limits': aturan usia maksimum per kategori (kelompok rentan)
+DEFAULT_SPEC = {
+    'Age_Group': {
+        'source': 'Age',
+        'edges': [15, 19, 22, 26],
+        'labels': ['16-19 (Sangat Muda)', '20-22 (Muda)', '23-25 (Dewasa Muda)']
+    },
+    'Vulnerable_Group': {
+        'source': 'Age',
+        'by': 'Gender',
+        'limits': {'Perempuan': 21, 'Laki-laki': 19},
+        'labels': {'Perempuan': 'Ya (Perempuan Muda)', 'Laki-laki': 'Ya (Laki-laki Sangat Muda)'},
+        'default': 'Tidak'
+    },
+    'Usage_Intensity': {
+        'source': 'Avg_Daily_Usage_Hours',
+        'edges': [0, 2, 5, 24],
+        'labels': ['Rendah', 'Sedang', 'Tinggi']
+    },
+    'Usage_Duration_Category': {
+        'source': 'Avg_Daily_Usage_Hours',
+        'edges': [-INF, 4, INF],
+        'labels': ['Penggunaan Rendah (≤{0} jam)', 'Penggunaan Tinggi (>{0} jam)']
+    },
+    'Addiction_Level': {
+        'source': 'Addicted_Score',
+        'edges': [0, 5, 8, 10],
+        'labels': ['Risiko Rendah', 'Risiko Sedang', 'Risiko Tinggi']
+    },
+    # Threshold BSMAS: Risiko Tinggi ≥ 8.67 (setara 26/30)
+    'High_Risk_Addiction': {
+        'source': 'Addicted_Score',
+        'edges': [-INF, 8.67, INF],
+        'labels': ['Tidak', 'Ya'],
+        'right': False
+    },
+    'Mental_Health_Category': {
+        'source': 'Mental_Health_Score',
+        'edges': [0, 3, 6, 10],
+        'labels': ['Buruk', 'Sedang', 'Baik']
+    },
+    'Mental_Health_Detail': {
+        'source': 'Mental_Health_Score',
+        'edges': [0, 3, 5, 7, 10],
+        'labels': ['Sangat Buruk (1-3)', 'Buruk (4-5)', 'Sedang (6-7)', 'Baik (8-10)']
+    },
+    'Sleep_Quality': {
+        'source': 'Sleep_Hours_Per_Night',
+        'edges': [0, 6, 7, 24],
+        'labels': ['Kurang', 'Cukup', 'Baik']
+    },
+    'Sleep_Quality_Detail': {
+        'source': 'Sleep_Hours_Per_Night',
+        'edges': [0, 5, 6, 7, 9, 24],
+        'labels': ['Sangat Kurang (<5h)', 'Kurang (5-6h)', 'Cukup (6-7h)', 'Baik (7-9h)', 'Berlebihan (>9h)']
+    },
+    'Conflict_Level': {
+        'source': 'Conflicts_Over_Social_Media',
+        'edges': [-1, 0, 2, 4, 10],
+        'labels': ['Tidak Ada', 'Rendah', 'Sedang', 'Tinggi']
+    }
+}
+
+
+def bin_labels(rule):
+    """Label akhir sebuah rule, dengan placeholder threshold sudah terisi"""
+    if 'by' in rule:
+        return list(rule['labels'].values()) + [rule['default']]
+    inner = [f"{edge:g}" for edge in rule['edges'][1:-1]]
+    return [label.format(*inner) for label in rule['labels']]
+
+
+def threshold(spec, column, index=0):
+    """Ambil edge internal ke-`index` dari rule `column` (mis. cutoff BSMAS)"""
+    return spec[column]['edges'][index + 1]
+
+
+def bin_values(values, edges, labels, right=True):
+    """
+    Bin array numerik dengan np.searchsorted.
+    Hasil identik dengan pd.cut(values, edges, labels=labels, right=right):
+    Categorical berurutan sesuai bin, nilai di luar rentang menjadi NaN.
+    """
+    values = np.asarray(values, dtype=float)
+    edges = np.asarray(edges, dtype=float)
+    codes = np.searchsorted(edges, values, side='left' if right else 'right') - 1
+    codes[(codes < 0) | (codes >= len(labels)) | np.isnan(values)] = -1
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
+
+
+def _apply_rule(df, rule):
+    if 'by' not in rule:
+        return bin_values(df[rule['source']], rule['edges'], bin_labels(rule), rule.get('right', True))
+
+    # Lookup per kategori via factorize, hindari perbandingan string per baris
+    codes, groups = pd.factorize(df[rule['by']])
+    # Code kategori: 0..g-1 = label grup, g = default
+    labels = bin_labels(rule)
+    default_code = len(labels) - 1
+    limits = np.array([rule['limits'].get(group, -INF) for group in groups] + [-INF])
+    label_codes = np.array([labels.index(rule['labels'][group]) if group in rule['labels'] else default_code
+                            for group in groups] + [default_code])
+    values = df[rule['source']].to_numpy(dtype=float)
+    result = np.where(values <= limits[codes], label_codes[codes], default_code)
+    return pd.Categorical.from_codes(result, categories=labels)
+
+
+def apply_bins(df, spec=DEFAULT_SPEC, columns=None):
+    """
+    Terapkan spec ke DataFrame, menimpa kolom kategori yang ada.
+    `columns` membatasi rule yang diterapkan (default: semua).
+    """
+    df = df.copy(deep=False)
+    for column, rule in spec.items():
+        if columns is not None and column not in columns:
+            continue
+        if rule['source'] in df.columns:
+            df[column] = _apply_rule(df, rule)
+    return df
+
+
+def cohort_mask(df, cohort):
+    """Boolean mask untuk kohort {kolom: nilai}; nilai "Semua" diabaikan"""
+    mask = np.ones(len(df), dtype=bool)
+    for column, value in cohort.items():
+        if value == "Semua":
+            continue
+        if column == 'Vulnerable_Group' and value in VULNERABLE_OPTIONS:
+            is_vulnerable = df[column].astype(str).str.contains("Ya", na=False).to_numpy()
+            mask &= is_vulnerable if value == 'Rentan' else ~is_vulnerable
+        else:
+            mask &= (df[column] == value).to_numpy()
+    return mask
+
+
+def with_thresholds(spec=DEFAULT_SPEC, addiction_edges=None, high_risk=None,
+                    high_usage=None, vulnerable_ages=None):
+    """Salin spec dengan threshold yang diubah dari sidebar"""
+    spec = copy.deepcopy(spec)
+    if addiction_edges is not None:
+        edges = spec['Addiction_Level']['edges']
+        edges[1:-1] = list(addiction_edges)
+    if high_risk is not None:
+        spec['High_Risk_Addiction']['edges'][1] = high_risk
+    if high_usage is not None:
+        spec['Usage_Duration_Category']['edges'][1] = high_usage
+    if vulnerable_ages is not None:
+        spec['Vulnerable_Group']['limits'].update(vulnerable_ages)
+    return spec
+
+
+def _persisted(st, widget, label, key, default, *args, **kwargs):
+    """
+    Widget yang nilainya bertahan saat pindah halaman. Streamlit menghapus
+    state widget yang tidak dirender, jadi nilai disalin ke key non-widget.
+    """
+    value = widget(label, *args, value=st.session_state.get(key, default), key=f"_{key}", **kwargs)
+    st.session_state[key] = value
+    return value
+
+
+def threshold_sidebar(st):
+    """Kontrol threshold di sidebar, mengembalikan spec hasil penyesuaian"""
+    limits = DEFAULT_SPEC['Vulnerable_Group']['limits']
+    with st.sidebar.expander("Pengaturan Threshold (Admin)"):
+        low, high = _persisted(
+            st, st.slider, "Batas Tingkat Kecanduan:", 'th_addiction_edges',
+            tuple(float(edge) for edge in DEFAULT_SPEC['Addiction_Level']['edges'][1:3]),
+            min_value=0.0, max_value=10.0, step=0.5,
+            help="Rendah ≤ batas pertama < Sedang ≤ batas kedua < Tinggi"
+        )
+        high_risk = _persisted(
+            st, st.number_input, "Cutoff Risiko Tinggi (BSMAS):", 'th_high_risk',
+            threshold(DEFAULT_SPEC, 'High_Risk_Addiction'),
+            min_value=0.0, max_value=10.0, step=0.01
+        )
+        high_usage = _persisted(
+            st, st.number_input, "Cutoff Penggunaan Tinggi (jam):", 'th_high_usage',
+            float(threshold(DEFAULT_SPEC, 'Usage_Duration_Category')),
+            min_value=0.0, max_value=24.0, step=0.5
+        )
+        female_age = _persisted(
+            st, st.number_input, "Usia Maks. Perempuan Rentan:", 'th_female_age',
+            limits['Perempuan'], min_value=16, max_value=25
+        )
+        male_age = _persisted(
+            st, st.number_input, "Usia Maks. Laki-laki Rentan:", 'th_male_age',
+            limits['Laki-laki'], min_value=16, max_value=25
+        )
+    return with_thresholds(
+        addiction_edges=(low, high),
+        high_risk=high_risk,
+        high_usage=high_usage,
+        vulnerable_ages={'Perempuan': female_age, 'Laki-laki': male_age}
+    )
@@ -0,0 +1,169 @@
+"""
+Cohort Comparison Engine
+========================
+Perbandingan dua kohort mahasiswa (didefinisikan lewat dimensi sidebar)
+dengan bootstrap confidence interval dan effect size. Tiap metrik
+di-resample sendiri sebagai multinomial atas nilai uniknya, jadi biaya
+bergantung pada jumlah nilai unik per kolom, bukan jumlah mahasiswa.
+"""
+
+import numpy as np
+import pandas as pd
+
+from binning import VULNERABLE_OPTIONS, cohort_mask
+
+# (label, kolom sumber, nilai "positif" untuk metrik proporsi / None untuk rata-rata)
+COMPARISON_METRICS = [
+    ('Rata-rata Penggunaan (jam/hari)', 'Avg_Daily_Usage_Hours', None),
+    ('Rata-rata Addiction Score', 'Addicted_Score', None),
+    ('Rata-rata Mental Health Score', 'Mental_Health_Score', None),
+    ('Rata-rata Jam Tidur', 'Sleep_Hours_Per_Night', None),
+    ('% Risiko Tinggi', 'High_Risk_Addiction', 'Ya'),
+    ('% Terdampak Akademik', 'Academic_Impact_Label', 'Terdampak')
+]
+
+# Dimensi yang bisa dipakai untuk mendefinisikan kohort di sidebar
+COHORT_DIMENSIONS = {
+    'Vulnerable_Group': 'Kelompok Rentan',
+    'Gender': 'Gender',
+    'Age_Group': 'Kelompok Usia',
+    'Platform_Type': 'Jenis Platform',
+    'Addiction_Level': 'Tingkat Kecanduan',
+    'Academic_Level': 'Jenjang Pendidikan'
+}
+
+# Resample diproses per chunk berukuran tetap, masing-masing dengan seed
+# turunan sendiri, agar hasil untuk seed yang sama selalu identik
+CHUNK_RESAMPLES = 1000
+
+
+def cohort_label(cohort):
+    """Nama singkat kohort untuk judul tabel"""
+    parts = [str(value) for value in cohort.values() if value != "Semua"]
+    return " / ".join(parts) if parts else "Semua Mahasiswa"
+
+
+def metric_matrix(df):
+    """Matriks (n, 6) nilai per baris; metrik proporsi dikodekan 0/1"""
+    columns = []
+    for _, column, positive in COMPARISON_METRICS:
+        if positive is None:
+            columns.append(df[column].to_numpy(dtype=float))
+        else:
+            columns.append((df[column] == positive).to_numpy(dtype=float))
+    return np.column_stack(columns)
+
+
+def _compress(column):
+    """Nilai unik + frekuensinya untuk satu kolom metrik"""
+    counts = pd.Series(column).value_counts(sort=False)
+    return counts.index.to_numpy(dtype=float), counts.to_numpy()
+
+
+def _bootstrap_means(values, n_resamples, seed_sequence):
+    """
+    Rata-rata bootstrap (n_resamples, n_metrics). Semua statistik yang
+    dilaporkan per metrik, jadi tiap kolom di-resample sendiri: mengambil n
+    baris dengan pengembalian setara dengan multinomial atas nilai unik kolom.
+    """
+    n = len(values)
+    compressed = [_compress(values[:, j]) for j in range(values.shape[1])]
+    means = np.empty((n_resamples, values.shape[1]))
+    n_chunks = -(-n_resamples // CHUNK_RESAMPLES)
+    for chunk, child in enumerate(seed_sequence.spawn(n_chunks)):
+        rng = np.random.default_rng(child)
+        start = chunk * CHUNK_RESAMPLES
+        size = min(CHUNK_RESAMPLES, n_resamples - start)
+        for j, (unique, counts) in enumerate(compressed):
+            weights = rng.multinomial(n, counts / n, size=size)
+            means[start:start + size, j] = weights @ unique / n
+    return means
+
+
+def bootstrap(values_a, values_b, n_resamples=2000, seed=0):
+    """Bootstrap independen kedua kohort"""
+    seed_a, seed_b = np.random.SeedSequence(seed).spawn(2)
+    return (_bootstrap_means(values_a, n_resamples, seed_a),
+            _bootstrap_means(values_b, n_resamples, seed_b))
+
+
+def effect_sizes(values_a, values_b):
+    """Cohen's d untuk metrik rata-rata, Cohen's h untuk metrik proporsi"""
+    mean_a, mean_b = values_a.mean(axis=0), values_b.mean(axis=0)
+    n_a, n_b = len(values_a), len(values_b)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pooled = np.sqrt(((n_a - 1) * values_a.var(axis=0, ddof=1) +
+                          (n_b - 1) * values_b.var(axis=0, ddof=1)) / (n_a + n_b - 2))
+        effect = (mean_a - mean_b) / pooled
+    is_proportion = np.array([positive is not None for _, _, positive in COMPARISON_METRICS])
+    effect[is_proportion] = (2 * np.arcsin(np.sqrt(mean_a[is_proportion])) -
+                             2 * np.arcsin(np.sqrt(mean_b[is_proportion])))
+    return effect
+
+
+def compare_cohorts(df, cohort_a, cohort_b, n_resamples=2000, confidence=0.95, seed=0):
+    """
+    Bandingkan dua kohort pada keenam metrik.
+    Mengembalikan DataFrame angka (proporsi dalam persen) atau None jika
+    salah satu kohort kosong.
+    """
+    values_a = metric_matrix(df[cohort_mask(df, cohort_a)])
+    values_b = metric_matrix(df[cohort_mask(df, cohort_b)])
+    if len(values_a) == 0 or len(values_b) == 0:
+        return None
+
+    boot_a, boot_b = bootstrap(values_a, values_b, n_resamples, seed)
+    tail = (1 - confidence) / 2 * 100
+    bounds = [tail, 100 - tail]
+    ci_a = np.percentile(boot_a, bounds, axis=0)
+    ci_b = np.percentile(boot_b, bounds, axis=0)
+    ci_diff = np.percentile(boot_a - boot_b, bounds, axis=0)
+
+    scale = np.array([1 if positive is None else 100 for _, _, positive in COMPARISON_METRICS])
+    mean_a, mean_b = values_a.mean(axis=0), values_b.mean(axis=0)
+    return pd.DataFrame({
+        'Metrik': [label for label, _, _ in COMPARISON_METRICS],
+        'mean_a': mean_a * scale, 'low_a': ci_a[0] * scale, 'high_a': ci_a[1] * scale,
+        'mean_b': mean_b * scale, 'low_b': ci_b[0] * scale, 'high_b': ci_b[1] * scale,
+        'diff': (mean_a - mean_b) * scale,
+        'low_diff': ci_diff[0] * scale, 'high_diff': ci_diff[1] * scale,
+        'effect_size': effect_sizes(values_a, values_b),
+        'n_a': len(values_a), 'n_b': len(values_b)
+    })
+
+
+def format_comparison(result, label_a, label_b):
+    """Tabel tampilan: nilai [CI] per kohort, selisih, dan effect size"""
+    def fmt(mean, low, high, metric):
+        unit = "%" if metric.startswith("%") else ""
+        return f"{mean:.1f}{unit} [{low:.1f}–{high:.1f}]"
+
+    return pd.DataFrame([
+        {
+            'Metrik': row.Metrik,
+            label_a: fmt(row.mean_a, row.low_a, row.high_a, row.Metrik),
+            label_b: fmt(row.mean_b, row.low_b, row.high_b, row.Metrik),
+            'Selisih': fmt(row.diff, row.low_diff, row.high_diff, row.Metrik),
+            'Effect Size': f"{row.effect_size:+.2f}"
+        }
+        for row in result.itertuples()
+    ])
+
+
+def cohort_sidebar(st, df, name, defaults=None):
+    """Selectbox per dimensi di sidebar untuk mendefinisikan satu kohort"""
+    defaults = defaults or {}
+    cohort = {}
+    with st.sidebar.expander(f"Kohort {name}"):
+        for column, label in COHORT_DIMENSIONS.items():
+            options = ["Semua"]
+            if column == 'Vulnerable_Group':
+                options += VULNERABLE_OPTIONS
+            options += sorted(df[column].dropna().unique())
+            default = defaults.get(column, "Semua")
+            cohort[column] = st.selectbox(
+                f"{label}:", options,
+                index=options.index(default) if default in options else 0,
+                key=f"cohort_{name}_{column}"
+            )
+    return cohort
@@ -9,31 +9,53 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from binning import CACHE_MAX_ENTRIES, apply_bins, threshold_sidebar
+from comparison import cohort_label, cohort_sidebar, compare_cohorts, format_comparison
+
 st.set_page_config(page_title="Kelompok Rentan", page_icon="⚠", layout="wide")
 
 @st.cache_data
 def load_data():
     return pd.read_csv('dataset_looker_student_social_media_clean.csv')
 
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_binned_data(spec):
+    return apply_bins(load_data(), spec)
+
+# Bootstrap di-cache per pasangan kohort (dan spec threshold)
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES, show_spinner="Menghitung bootstrap confidence interval...")
+def compare_cached(spec, cohort_a, cohort_b, n_resamples):
+    return compare_cohorts(load_binned_data(spec), cohort_a, cohort_b, n_resamples)
+
 st.title("Analisis Kelompok Rentan")
 st.markdown("---")
 
-df = load_data()
+spec = threshold_sidebar(st)
+df = load_binned_data(spec)
+limits = spec['Vulnerable_Group']['limits']
+
+# Sidebar: definisi kohort untuk tabel perbandingan
+st.sidebar.header("Perbandingan Kohort")
+cohort_a = cohort_sidebar(st, df, "A", {'Vulnerable_Group': 'Rentan'})
+cohort_b = cohort_sidebar(st, df, "B", {'Vulnerable_Group': 'Non-Rentan'})
+n_resamples = st.sidebar.select_slider(
+    "Jumlah Resample Bootstrap:", [500, 1000, 2000, 5000, 10000], value=2000
+)
 
 # Filter hanya kelompok rentan
-vulnerable_df = df[df['Vulnerable_Group'].str.contains("Ya", na=False)]
+vulnerable_df = df[df['Vulnerable_Group'].astype(str).str.contains("Ya", na=False)]
 
 # KPIs
 col1, col2, col3, col4 = st.columns(4)
 
 with col1:
-    perempuan_muda = len(vulnerable_df[vulnerable_df['Vulnerable_Group'].str.contains("Perempuan")])
-    st.metric("Perempuan Muda (≤21th)", f"{perempuan_muda}", 
+    perempuan_muda = len(vulnerable_df[vulnerable_df['Vulnerable_Group'].astype(str).str.contains("Perempuan")])
+    st.metric(f"Perempuan Muda (≤{limits['Perempuan']}th)", f"{perempuan_muda}", 
               delta=f"{perempuan_muda/len(df)*100:.1f}% dari total")
 
 with col2:
-    laki_muda = len(vulnerable_df[vulnerable_df['Vulnerable_Group'].str.contains("Laki-laki")])
-    st.metric("Laki-laki Sangat Muda (≤19th)", f"{laki_muda}",
+    laki_muda = len(vulnerable_df[vulnerable_df['Vulnerable_Group'].astype(str).str.contains("Laki-laki")])
+    st.metric(f"Laki-laki Sangat Muda (≤{limits['Laki-laki']}th)", f"{laki_muda}",
               delta=f"{laki_muda/len(df)*100:.1f}% dari total")
 
 with col3:
@@ -54,6 +76,7 @@ col1, col2 = st.columns(2)
 with col1:
     st.subheader("Breakdown Kelompok Rentan")
     vulnerable_breakdown = vulnerable_df['Vulnerable_Group'].value_counts()
+    vulnerable_breakdown = vulnerable_breakdown[vulnerable_breakdown > 0]
     fig1 = px.pie(
         values=vulnerable_breakdown.values,
         names=vulnerable_breakdown.index,
@@ -64,7 +87,7 @@ with col1:
 
 with col2:
     st.subheader("Tingkat Kecanduan per Kelompok")
-    vulnerable_addiction = vulnerable_df.groupby(['Vulnerable_Group', 'Addiction_Level']).size().reset_index(name='count')
+    vulnerable_addiction = vulnerable_df.groupby(['Vulnerable_Group', 'Addiction_Level'], observed=True).size().reset_index(name='count')
     fig2 = px.bar(
         vulnerable_addiction,
         x='Vulnerable_Group',
@@ -149,39 +172,20 @@ else:
 
 # Statistics comparison
 st.markdown("---")
-st.subheader("Perbandingan: Kelompok Rentan vs Non-Rentan")
-
-non_vulnerable = df[~df['Vulnerable_Group'].str.contains("Ya", na=False)]
-
-comparison_data = {
-    'Metrik': [
-        'Rata-rata Penggunaan (jam/hari)',
-        'Rata-rata Addiction Score',
-        'Rata-rata Mental Health Score',
-        'Rata-rata Jam Tidur',
-        '% Risiko Tinggi',
-        '% Terdampak Akademik'
-    ],
-    'Kelompok Rentan': [
-        f"{vulnerable_df['Avg_Daily_Usage_Hours'].mean():.1f}",
-        f"{vulnerable_df['Addicted_Score'].mean():.1f}",
-        f"{vulnerable_df['Mental_Health_Score'].mean():.1f}",
-        f"{vulnerable_df['Sleep_Hours_Per_Night'].mean():.1f}",
-        f"{(vulnerable_df['High_Risk_Addiction'] == 'Ya').sum() / len(vulnerable_df) * 100:.1f}%",
-        f"{(vulnerable_df['Academic_Impact_Label'] == 'Terdampak').sum() / len(vulnerable_df) * 100:.1f}%"
-    ],
-    'Non-Rentan': [
-        f"{non_vulnerable['Avg_Daily_Usage_Hours'].mean():.1f}",
-        f"{non_vulnerable['Addicted_Score'].mean():.1f}",
-        f"{non_vulnerable['Mental_Health_Score'].mean():.1f}",
-        f"{non_vulnerable['Sleep_Hours_Per_Night'].mean():.1f}",
-        f"{(non_vulnerable['High_Risk_Addiction'] == 'Ya').sum() / len(non_vulnerable) * 100:.1f}%",
-        f"{(non_vulnerable['Academic_Impact_Label'] == 'Terdampak').sum() / len(non_vulnerable) * 100:.1f}%"
-    ]
-}
+label_a, label_b = f"A: {cohort_label(cohort_a)}", f"B: {cohort_label(cohort_b)}"
+st.subheader(f"Perbandingan: {label_a} vs {label_b}")
+
+comparison = compare_cached(spec, cohort_a, cohort_b, n_resamples)
 
-comparison_df = pd.DataFrame(comparison_data)
-st.table(comparison_df)
+if comparison is not None:
+    st.table(format_comparison(comparison, label_a, label_b))
+    st.caption(
+        f"n = {comparison['n_a'].iloc[0]:,} vs {comparison['n_b'].iloc[0]:,}. "
+        f"Nilai [95% CI] dari {n_resamples:,} resample bootstrap. "
+        "Effect size: Cohen's d (rata-rata) dan Cohen's h (persentase)."
+    )
+else:
+    st.warning("Salah satu kohort tidak memiliki data. Ubah definisi kohort di sidebar.")
 
 st.warning("""
 **Rekomendasi Intervensi:**
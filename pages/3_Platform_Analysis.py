@@ -9,23 +9,31 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from binning import CACHE_MAX_ENTRIES, apply_bins, threshold, threshold_sidebar
+
 st.set_page_config(page_title="Analisis Platform", page_icon="P", layout="wide")
 
 @st.cache_data
 def load_data():
     return pd.read_csv('dataset_looker_student_social_media_clean.csv')
 
+@st.cache_data(max_entries=CACHE_MAX_ENTRIES)
+def load_binned_data(spec):
+    return apply_bins(load_data(), spec)
+
 st.title("Analisis Platform Media Sosial")
 st.markdown("---")
 
-df = load_data()
+spec = threshold_sidebar(st)
+df = load_binned_data(spec)
 
 # Platform selector
 platforms = sorted(df['Platform_Type'].unique())
 selected_platforms = st.multiselect(
     "Pilih Platform untuk Dibandingkan:",
     platforms,
-    default=platforms
+    default=platforms,
+    key="platforms"
 )
 
 filtered_df = df[df['Platform_Type'].isin(selected_platforms)]
@@ -62,8 +70,9 @@ with col1:
         color=usage_by_platform.values,
         color_continuous_scale='Oranges'
     )
-    fig1.add_vline(x=4, line_dash="dash", line_color="red",
-                   annotation_text="Threshold 4 jam")
+    high_usage_cutoff = threshold(spec, 'Usage_Duration_Category')
+    fig1.add_vline(x=high_usage_cutoff, line_dash="dash", line_color="red",
+                   annotation_text=f"Threshold {high_usage_cutoff:g} jam")
     fig1.update_layout(showlegend=False, xaxis_title="Jam per Hari", yaxis_title="")
     st.plotly_chart(fig1, use_container_width=True)
 
@@ -78,7 +87,7 @@ with col2:
         color=addiction_by_platform.values,
         color_continuous_scale='Reds'
     )
-    fig2.add_vline(x=8.67, line_dash="dash", line_color="darkred",
+    fig2.add_vline(x=threshold(spec, 'High_Risk_Addiction'), line_dash="dash", line_color="darkred",
                    annotation_text="Threshold Risiko Tinggi")
     fig2.update_layout(showlegend=False, xaxis_title="Addiction Score", yaxis_title="")
     st.plotly_chart(fig2, use_container_width=True)
@@ -142,7 +151,7 @@ fig5 = px.scatter(
 
 # Add quadrant lines
 fig5.add_hline(y=6, line_dash="dash", line_color="gray", opacity=0.5)
-fig5.add_vline(x=4, line_dash="dash", line_color="gray", opacity=0.5)
+fig5.add_vline(x=threshold(spec, 'Usage_Duration_Category'), line_dash="dash", line_color="gray", opacity=0.5)
 
 # Add quadrant labels
 fig5.add_annotation(x=2, y=8.5, text="IDEAL<br>(Low Usage, Good Mental Health)", 
@@ -165,7 +174,7 @@ st.plotly_chart(fig5, use_container_width=True)
 st.markdown("---")
 st.subheader("Distribusi Tingkat Kecanduan per Platform")
 
-addiction_dist = filtered_df.groupby(['Platform_Type', 'Addiction_Level']).size().reset_index(name='count')
+addiction_dist = filtered_df.groupby(['Platform_Type', 'Addiction_Level'], observed=True).size().reset_index(name='count')
 
 fig6 = px.bar(
     addiction_dist,
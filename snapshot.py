@@ -0,0 +1,316 @@
+"""
+Static Snapshot Renderer
+========================
+Render halaman dashboard ke laporan HTML mandiri (figure Plotly tertanam)
+untuk stakeholder tanpa akses dashboard. Halaman dijalankan headless lewat
+streamlit.testing (kode halaman dipakai apa adanya), kombinasi filter
+di-render paralel di process pool, dan output yang versinya tidak berubah
+dilewati.
+
+Contoh:
+    python snapshot.py --out reports
+    python snapshot.py --out reports --by Gender Age_Group --jobs 4
+"""
+
+import argparse
+import hashlib
+import html
+import itertools
+import json
+import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+from binning import apply_bins, cohort_mask
+from comparison import COHORT_DIMENSIONS
+
+ROOT = Path(__file__).resolve().parent
+DATA_FILE = 'dataset_looker_student_social_media_clean.csv'
+MANIFEST_FILE = 'manifest.json'
+
+# Modul yang ikut menentukan isi laporan (perubahan kode = render ulang)
+SOURCE_FILES = ['binning.py', 'comparison.py', 'analytics.py', 'snapshot.py']
+
+# Filter sidebar halaman utama yang bisa diatur per kombinasi
+EXECUTIVE_FILTERS = ['Gender', 'Age_Group', 'Platform_Type', 'Addiction_Level']
+
+# Dimensi yang bisa dipakai untuk --by (checkbox rentan hanya bisa "Rentan")
+SNAPSHOT_DIMENSIONS = EXECUTIVE_FILTERS + ['Vulnerable_Group']
+
+
+def _supports_executive(combo):
+    return all(
+        column in EXECUTIVE_FILTERS or (column == 'Vulnerable_Group' and value == 'Rentan')
+        for column, value in combo.items()
+    )
+
+
+def _apply_executive(at, combo):
+    for column, value in combo.items():
+        if column == 'Vulnerable_Group':
+            at.checkbox(key="filter_vulnerable").check()
+        else:
+            at.selectbox(key=f"filter_{column}").set_value(value)
+
+
+def _apply_platform(at, combo):
+    at.multiselect(key="platforms").set_value([combo['Platform_Type']])
+
+
+# nama laporan -> (script halaman, kombinasi yang didukung?, penerap filter)
+# Halaman Kelompok Rentan selalu menganalisis seluruh data (hanya tabel
+# perbandingan yang mengikuti kohort), jadi hanya di-render tanpa filter
+PAGES = {
+    'executive': ('app.py', _supports_executive, _apply_executive),
+    'kelompok_rentan': ('pages/2_Kelompok_Rentan.py', lambda combo: False, None),
+    'platform': ('pages/3_Platform_Analysis.py', lambda combo: set(combo) == {'Platform_Type'}, _apply_platform)
+}
+
+
+def file_hash(*paths):
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(ROOT, path).read_bytes())
+    return digest.hexdigest()
+
+
+def combo_slug(combo):
+    return "__".join(
+        f"{column}-{re.sub(r'[^A-Za-z0-9]+', '-', str(value)).strip('-')}"
+        for column, value in combo.items()
+    )
+
+
+def combinations(df, dimensions):
+    """Semua kombinasi nilai dari dimensi yang dipilih"""
+    values = []
+    for column in dimensions:
+        if column == 'Vulnerable_Group':
+            values.append(['Rentan'])
+        else:
+            values.append(sorted(df[column].dropna().unique()))
+    return [dict(zip(dimensions, combo)) for combo in itertools.product(*values)]
+
+
+def build_tasks(dimensions, data_version):
+    """Daftar (file output, halaman, kombinasi, versi) yang perlu ada"""
+    combos = [{}]
+    if dimensions:
+        df = apply_bins(pd.read_csv(ROOT / DATA_FILE))
+        # Kombinasi tanpa mahasiswa hanya menghasilkan halaman kosong
+        combos += [combo for combo in combinations(df, dimensions) if cohort_mask(df, combo).any()]
+
+    tasks = []
+    for name, (script, supports, _) in PAGES.items():
+        page_version = file_hash(script)
+        for combo in combos:
+            if combo and not supports(combo):
+                continue
+            filename = f"{name}__{combo_slug(combo)}.html" if combo else f"{name}.html"
+            version = hashlib.sha256(
+                f"{data_version}:{page_version}:{json.dumps(combo, sort_keys=True)}".encode()
+            ).hexdigest()
+            tasks.append((filename, name, combo, version))
+    return tasks
+
+
+# HTML rendering
+
+ALERT_COLORS = {
+    'info': '#E3F2FD', 'success': '#E8F5E9', 'warning': '#FFF8E1', 'error': '#FFEBEE'
+}
+
+STYLE = """
+body { font-family: sans-serif; max-width: 1400px; margin: 0 auto; padding: 1rem 2rem; color: #262730; }
+.row { display: flex; gap: 1.5rem; }
+.row > .col { flex: 1; min-width: 0; }
+.metric { background-color: #f0f2f6; padding: 1rem; border-radius: 0.5rem; border-left: 4px solid #1976D2; }
+.metric .label { font-size: 0.9rem; color: gray; }
+.metric .value { font-size: 2rem; }
+.alert { padding: 1rem; border-radius: 0.5rem; margin: 0.5rem 0; }
+.caption { font-size: 0.85rem; color: gray; }
+table { border-collapse: collapse; width: 100%; font-size: 0.9rem; }
+th, td { border: 1px solid #ddd; padding: 0.3rem 0.6rem; text-align: left; }
+.filters { background-color: #f0f2f6; padding: 0.5rem 1rem; border-radius: 0.5rem; }
+"""
+
+
+def _markdown(text):
+    # Subset markdown yang dipakai halaman: garis, tebal, list, HTML mentah
+    text = text.strip()
+    if text == "---":
+        return "<hr>"
+    if text.startswith("<"):
+        return text
+    text = html.escape(text)
+    text = re.sub(r"\*\*(.+?)\*\*", r"<b>\1</b>", text)
+    return "<p>" + text.replace("\n", "<br>") + "</p>"
+
+
+def _render_element(node):
+    kind = getattr(node, 'type', None)
+    if kind in ('title', 'header', 'subheader'):
+        level = {'title': 1, 'header': 2, 'subheader': 3}[kind]
+        return f"<h{level}>{html.escape(node.value)}</h{level}>"
+    if kind == 'markdown':
+        return _markdown(node.value)
+    if kind == 'caption':
+        return f'<p class="caption">{html.escape(node.value)}</p>'
+    if kind in ALERT_COLORS:
+        return f'<div class="alert" style="background-color: {ALERT_COLORS[kind]}">{_markdown(node.value)}</div>'
+    if kind == 'metric':
+        delta = f'<div class="delta">{html.escape(node.delta)}</div>' if node.delta else ""
+        return (f'<div class="metric"><div class="label">{html.escape(node.label)}</div>'
+                f'<div class="value">{html.escape(node.value)}</div>{delta}</div>')
+    if kind in ('dataframe', 'table'):
+        return node.value.to_html(border=0)
+    if kind == 'plotly_chart':
+        figure = pio.from_json(node.proto.spec)
+        return pio.to_html(figure, full_html=False, include_plotlyjs=False)
+    return ""
+
+
+def _render_block(node):
+    from streamlit.testing.v1.element_tree import Block
+
+    parts = []
+    for child in node.children.values():
+        if not isinstance(child, Block):
+            parts.append(_render_element(child))
+            continue
+        inner = _render_block(child)
+        if child.type == 'column':
+            inner = f'<div class="col">{inner}</div>'
+        elif any(getattr(grandchild, 'type', None) == 'column' for grandchild in child.children.values()):
+            inner = f'<div class="row">{inner}</div>'
+        parts.append(inner)
+    return "\n".join(parts)
+
+
+def render_page(name, combo, timeout=300):
+    """Jalankan satu halaman headless dengan filter `combo`, hasilkan HTML mandiri"""
+    from streamlit.testing.v1 import AppTest
+
+    script, _, apply_combo = PAGES[name]
+    at = AppTest.from_file(str(ROOT / script), default_timeout=timeout).run()
+    if combo:
+        apply_combo(at, combo)
+        at.run()
+    if at.exception:
+        raise RuntimeError(f"{script}: {at.exception[0].value}")
+
+    title = at.title[0].value if len(at.title) else name
+    filters = ", ".join(f"{COHORT_DIMENSIONS.get(column, column)}: {value}"
+                        for column, value in combo.items()) or "Tanpa filter (default)"
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{html.escape(title)}</title>
+<script type="text/javascript">{get_plotlyjs()}</script>
+<style>{STYLE}</style>
+</head>
+<body>
+<p class="filters"><b>Filter:</b> {html.escape(filters)}</p>
+{_render_block(at.main)}
+</body>
+</html>
+"""
+
+
+def _init_worker():
+    # Halaman membaca CSV dengan path relatif & mengimpor modul dari root
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+
+
+def _render_task(out_dir, filename, name, combo):
+    Path(out_dir, filename).write_text(render_page(name, combo), encoding="utf-8")
+
+
+def render_all(out_dir, dimensions=(), jobs=None, force=False):
+    """
+    Render semua halaman (+ kombinasi dimensi) ke `out_dir`.
+    Output yang versinya sama dengan manifest dilewati.
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    manifest_path = out_dir / MANIFEST_FILE
+    manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+
+    data_version = file_hash(DATA_FILE, *SOURCE_FILES)
+    tasks = build_tasks(list(dimensions), data_version)
+    # Laporan dari run dengan --by lain tidak masuk manifest & index
+    current = {task[0] for task in tasks}
+    manifest = {filename: version for filename, version in manifest.items() if filename in current}
+    pending = [
+        task for task in tasks
+        if force or manifest.get(task[0]) != task[3] or not (out_dir / task[0]).exists()
+    ]
+    print(f"{len(tasks)} laporan, {len(tasks) - len(pending)} tidak berubah, {len(pending)} di-render")
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as executor:
+        futures = {
+            executor.submit(_render_task, str(out_dir), filename, name, combo): (filename, version)
+            for filename, name, combo, version in pending
+        }
+        for future in as_completed(futures):
+            filename, version = futures[future]
+            try:
+                future.result()
+            except Exception as error:
+                # Satu laporan gagal tidak menghentikan batch; dicoba lagi di run berikutnya
+                manifest.pop(filename, None)
+                print(f"  GAGAL {filename}: {error}")
+            else:
+                manifest[filename] = version
+                print(f"  {filename}")
+
+    manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    _write_index(out_dir, manifest)
+
+
+def _write_index(out_dir, manifest):
+    links = "\n".join(
+        f'<li><a href="{html.escape(filename)}">{html.escape(filename[:-5])}</a></li>'
+        for filename in sorted(manifest)
+    )
+    Path(out_dir, "index.html").write_text(f"""<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Laporan Dashboard Kecanduan Media Sosial</title>
+<style>{STYLE}</style></head>
+<body>
+<h1>Laporan Dashboard Kecanduan Media Sosial Mahasiswa</h1>
+<ul>
+{links}
+</ul>
+</body>
+</html>
+""", encoding="utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render dashboard ke laporan HTML statis")
+    parser.add_argument("--out", default="reports", help="Folder output (default: reports)")
+    parser.add_argument("--by", nargs="*", default=[], choices=SNAPSHOT_DIMENSIONS,
+                        help="Dimensi untuk kombinasi filter, mis. Gender Age_Group")
+    parser.add_argument("--jobs", type=int, default=None, help="Jumlah proses paralel (default: jumlah CPU)")
+    parser.add_argument("--force", action="store_true", help="Render ulang semua laporan")
+    args = parser.parse_args()
+
+    _init_worker()
+    render_all(args.out, args.by, args.jobs, args.force)
+
+
+if __name__ == "__main__":
+    # AppTest mengganti modul __main__ di worker, jadi fungsi task harus
+    # di-pickle sebagai snapshot._render_task, bukan __main__._render_task
+    import snapshot
+    snapshot.main()